@@ -1,16 +1,27 @@
 import os
-import json
+import argparse
+import orjson
 import ffmpeg
+import ctranslate2
+import subprocess
+import cv2
 import numpy as np
 from itertools import chain
-from scipy.ndimage import gaussian_filter
-from faster_whisper import WhisperModel
-from moviepy.editor import TextClip, CompositeVideoClip, concatenate_videoclips, VideoFileClip, ColorClip
+from functools import partial, lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 
 JSON_INFO = 'info.json'
 JSON_RAW_OUTPUT = 'output.json'
 JSON_MODIFIED_OUTPUT = 'modifiedOutput.json'
 
+#Buffer size for ffmpeg pipes, large enough to move a lot of audio per read
+PIPE_BUFFER_SIZE = 1 << 20
+
+#Loaded WhisperModels keyed by model size, so weights are only read from disk once per process
+_MODEL_CACHE = {}
+
 def load_json_data(json_filename):
     """
     Loads JSON data from a file.
@@ -22,12 +33,12 @@ def load_json_data(json_filename):
         dict or None: Parsed JSON data if successful, None otherwise.
     """
     try:
-        with open(json_filename, 'r') as file:
-            data = json.load(file)
+        with open(json_filename, 'rb') as file:
+            data = orjson.loads(file.read())
         return data
     except FileNotFoundError:
         print(f"Error: '{json_filename}' not found")
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"Error: Could not decode JSON from '{json_filename}'")
     # Return None if file not found or JSON is invalid
     return None
@@ -40,59 +51,90 @@ def write_json_data(json_filename, data):
         json_filename (str): Path to the JSON file.
         data (dict): Data to write to the file.
     """
-    with open(json_filename, 'w') as file:
-        json.dump(data, file, indent=4)
+    with open(json_filename, 'wb') as file:
+        file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
-def convert_mp3_to_mp4(mp4_file):
+def extract_audio(mp4_file):
     """
-    Extracts audio from an MP4 video file and saves it as an MP3 file.
+    Decodes the audio of an MP4 video file to 16 kHz mono samples, the format Whisper works in.
 
     Args:
         mp4_file (str): Path to the MP4 video file.
 
     Returns:
-        str or None: Path to the generated MP3 file, or None if failed.
+        np.ndarray or None: float32 samples in [-1, 1], or None if failed.
     """
-    audio_file_path = mp4_file.replace('.mp4', '.mp3')
-
     # Check if the input video file exists
     if not os.path.exists(mp4_file):
         print(f"Error: '{mp4_file}' not found")
         return None
 
+    # Use ffmpeg to decode the audio straight to float32 PCM on stdout, the exact layout Whisper takes
+    video_stream = ffmpeg.input(mp4_file)
+    audio = video_stream.audio
+    audio_stream = ffmpeg.output(audio, 'pipe:', format='f32le', acodec='pcm_f32le', ac=1, ar=16000)
+
+    #Read the pipe in large chunks so a long video does not cost a syscall per 8 KiB
     try:
-        # Use ffmpeg to extract audio
-        video_stream = ffmpeg.input(mp4_file)
-        audio = video_stream.audio
-        audio_stream = ffmpeg.output(audio, audio_file_path, acodec='mp3')
-        audio_stream = ffmpeg.overwrite_output(audio_stream)
-        audio_stream.run()
-        print(f"MP3 file generated: {audio_file_path}")
-        return audio_file_path
-    except ffmpeg.Error as e:
+        process = subprocess.Popen(ffmpeg.compile(audio_stream), stdout=subprocess.PIPE, bufsize=PIPE_BUFFER_SIZE)
+    except OSError as e:
         print(f"ffmpeg error: {e}")
         return None
-            
-def set_raw_output(audio_filename, model_size = 'medium'):
+
+    with process:
+        raw_audio = b"".join(iter(lambda: process.stdout.read(PIPE_BUFFER_SIZE), b""))
+
+    if process.returncode != 0:
+        print(f"ffmpeg error: could not decode audio from '{mp4_file}'")
+        return None
+
+    return np.frombuffer(raw_audio, np.float32)
+
+def get_model(model_size):
+    """
+    Returns a cached WhisperModel for the given size, loading it on first use.
+
+    Runs in float16 on a CUDA GPU when one is available, otherwise falls back to
+    int8 quantized weights on the CPU.
+
+    Args:
+        model_size (str): Whisper model size to load.
+
+    Returns:
+        WhisperModel: The loaded model.
+    """
+    if model_size not in _MODEL_CACHE:
+        if ctranslate2.get_cuda_device_count() > 0:
+            device, compute_type = 'cuda', 'float16'
+        else:
+            device, compute_type = 'cpu', 'int8'
+
+        _MODEL_CACHE[model_size] = WhisperModel(model_size, device=device, compute_type=compute_type)
+    return _MODEL_CACHE[model_size]
+
+def set_raw_output(audio, model_size = 'medium', batch_size = 16):
     """
-    Transcribes audio using WhisperModel and saves word-level info to a JSON file.
+    Transcribes audio using a batched WhisperModel and returns word-level info.
 
     Args:
-        audio_filename (str): Path to the audio file to transcribe.
+        audio (np.ndarray): 16 kHz mono float32 samples to transcribe.
+        model_size (str, optional): Whisper model size to load. Defaults to 'medium'.
+        batch_size (int, optional): Number of VAD chunks decoded per batch. Defaults to 16.
 
     Returns:
-        None
+        generator: Word dictionaries with 'start', 'end', and 'word' keys, yielded as segments are decoded.
     """
-    model = WhisperModel(model_size)
+    model = get_model(model_size)
+    batched_model = BatchedInferencePipeline(model=model)
 
-    segments, info = model.transcribe(audio_filename, word_timestamps=True)
+    segments, info = batched_model.transcribe(audio, batch_size=batch_size, word_timestamps=True)
 
-    word_info = []
-    for segment in segments:
-        for word in segment.words:
-            word_info.append({'start': float(word.start), 'end': float(word.end), 'word': word.word})
+    word_info = (
+        {'start': float(word.start), 'end': float(word.end), 'word': word.word}
+        for word in chain.from_iterable(segment.words for segment in segments)
+    )
 
-    write_json_data(JSON_RAW_OUTPUT, word_info)    
+    return word_info
 
 def combine_words(data, max_chars = 30, max_duration = 2.5, max_gap = 1.5):
     """
@@ -107,172 +149,289 @@ def combine_words(data, max_chars = 30, max_duration = 2.5, max_gap = 1.5):
     Returns:
         list: List of subtitle line dictionaries with 'start', 'end', and 'line' keys.
     """
-    subtitle_lines = []
+    return list(iter_subtitle_lines(data, max_chars, max_duration, max_gap))
 
-    current_line = {
-        'text': "",
-        'start': None,
-        'end': None,
-        'duration': 0.0,
-        'words': []        
-    }
+def iter_subtitle_lines(words, max_chars = 30, max_duration = 2.5, max_gap = 1.5):
+    """
+    Combines words into subtitle lines as they arrive, based on character, duration, and gap constraints.
+
+    This is the only line splitting implementation; combine_words collects it into a list.
+
+    Args:
+        words (iterable): Word dictionaries with 'start', 'end', and 'word' keys.
+        max_chars (int): Maximum number of characters per subtitle line.
+        max_duration (float): Maximum duration (in seconds) per subtitle line.
+        max_gap (float): Maximum allowed gap (in seconds) between words in the same line.
 
-    for i, word_data in enumerate(data):         
-        word_text = word_data['word']    
-        word_start = word_data['start']
-        word_end = word_data['end']
-        word_duration = word_end - word_start
+    Yields:
+        dict: Subtitle line dictionaries with 'start', 'end', 'line' and 'words' keys.
+    """
+    line_words = []
+    line_text = ""
+    line_duration = 0.0
+    previous_end = None
 
-        #calculate gap from previous word
-        gap = 0
-        if i > 0:
-            gap = word_start - data[i - 1]['end']
+    for word_data in words:
+        word_duration = word_data['end'] - word_data['start']
+        gap = 0 if previous_end is None else word_data['start'] - previous_end
+        previous_end = word_data['end']
 
         #Checking if any constraints have been hit
-        max_time_hit = (current_line['duration'] + word_duration) > max_duration
-        max_chars_hit = (len(current_line['text']) + len(word_text)) >= max_chars
+        max_time_hit = (line_duration + word_duration) > max_duration
+        max_chars_hit = (len(line_text) + len(word_data['word'])) >= max_chars
         max_gap_hit = gap > max_gap
-            
-        if current_line['text'] and (max_time_hit or max_chars_hit or max_gap_hit):            
-            subtitle_lines.append({
-                'start': current_line['start'], 
-                'end': current_line['end'], 
-                'line': current_line['text'].strip(),
-                'words': current_line['words']
-                })
-            
-            current_line = {
-                'text': "",
-                'start': None,
-                'end': None,
-                'duration': 0.0,
-                'words': []
+
+        if line_text and (max_time_hit or max_chars_hit or max_gap_hit):
+            yield {
+                'start': line_words[0]['start'],
+                'end': line_words[-1]['end'],
+                'line': line_text.strip(),
+                'words': line_words
             }
-      
-        #Start time for the new line if needed
-        if current_line['start'] is None:
-            current_line['start'] = word_start
-
-        current_line['words'].append({
-            'text': word_text,
-            'start': word_start,
-            'end': word_end
-        }) 
-        current_line['text'] += word_text
-        current_line['end'] = word_end
-        current_line['duration'] += word_duration
+            line_words = []
+            line_text = ""
+            line_duration = 0.0
 
-    #Add any remaining text as the last subtitle line
-    if current_line['text']:
-        subtitle_lines.append({
-            'start': current_line['start'], 
-            'end': current_line['end'], 
-            'line': current_line['text'].strip(),
-            'words': current_line['words']
-        })
-    
-    return subtitle_lines
+        line_words.append({'text': word_data['word'], 'start': word_data['start'], 'end': word_data['end']})
+        line_text += word_data['word']
+        line_duration += word_duration
 
-def blur(clip, sigma):
+    #Add any remaining text as the last subtitle line
+    if line_text:
+        yield {
+            'start': line_words[0]['start'],
+            'end': line_words[-1]['end'],
+            'line': line_text.strip(),
+            'words': line_words
+        }
+
+def blur(image, sigma):
     """
-    Applies a Gaussian blur to a MoviePy clip using scipy's gaussian_filter.
+    Applies a Gaussian blur to a single channel image using OpenCV's separable GaussianBlur.
 
     Args:
-        clip (VideoClip): The MoviePy clip to blur.
+        image (np.ndarray): (height, width) uint8 image, e.g. an alpha plane.
         sigma (float): The standard deviation for Gaussian kernel.
 
     Returns:
-        VideoClip: The blurred clip.
+        np.ndarray: The blurred image.
+    """
+    #Kernel covers 4 sigma on each side, same as gaussian_filter's default truncate=4.0
+    kernel_size = int(2 * round(4 * sigma) + 1)
+    return cv2.GaussianBlur(image, (kernel_size, kernel_size), sigma)
+
+def split_font_pattern(font):
+    """
+    Splits a fontconfig pattern like "Calibri:style=Bold" into its family and style.
+
+    Args:
+        font (str): Font family, optionally followed by fontconfig ':' properties.
+
+    Returns:
+        tuple: (family, style) where style is None if the pattern has none.
+    """
+    family, *properties = font.split(':')
+    style = None
+    for font_property in properties:
+        name, _, value = font_property.partition('=')
+        if name.strip().lower() == 'style':
+            style = value.strip()
+    return family.strip(), style
+
+@lru_cache(maxsize=None)
+def resolve_font(font):
+    """
+    Resolves a font name or path to a font file Pillow can open.
+
+    Args:
+        font (str): Path to a font file, or a fontconfig pattern such as "Calibri:style=Bold".
+
+    Returns:
+        str: Path (or Pillow-searchable file name) of the font.
+    """
+    try:
+        ImageFont.truetype(font)
+        return font
+    except OSError:
+        pass
+
+    #Fall back to fontconfig to turn a font pattern into a file path
+    try:
+        output = subprocess.run(['fc-match', '--format=%{family}\n%{file}', font], capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        raise OSError(f"Could not find font '{font}', use a path to a font file or a fontconfig pattern")
+
+    #fc-match always prints its closest match, so a missing font shows up as a different family
+    matched_families, _, font_path = output.partition('\n')
+    matched_families = [matched_family.strip() for matched_family in matched_families.split(',')]
+    family, _ = split_font_pattern(font)
+
+    if family.lower() not in (matched_family.lower() for matched_family in matched_families):
+        raise OSError(f"Could not find font '{font}', fontconfig would fall back to '{matched_families[0]}'")
+    return font_path
+
+@lru_cache(maxsize=None)
+def load_font(font, font_size):
+    """
+    Loads a TrueType font once per process so every caption reuses the same glyph cache.
+
+    Args:
+        font (str): Path to a font file, or a font name that fontconfig can resolve.
+        font_size (int): Font size in pixels.
+
+    Returns:
+        ImageFont.FreeTypeFont: The loaded font.
     """
-    return clip.fl_image(lambda image: gaussian_filter(image, sigma=sigma), apply_to=['mask'])
+    return ImageFont.truetype(resolve_font(font), font_size)
 
-def add_shadow_caption(text, font, font_size, start, duration, position, sigma, offset=(2,2)):
+@lru_cache(maxsize=32)
+def _render_shadow(text, font, font_size, sigma, canvas_size, origin):
     """
-    Creates a shadow TextClip for a caption by offsetting and blurring the text.
+    Renders and blurs the shadow mask for a caption, memoized since caption lines often repeat.
+
+    Only the alpha plane is kept, the shadow color is filled in when it is composited.
 
     Args:
         text (str): The caption text.
-        font (str): Font name for the shadow text.
+        font (str): Font file or name for the shadow text.
         font_size (int): Font size for the shadow text.
-        start (float): Start time of the shadow clip.
-        duration (float): Duration of the shadow clip.
-        position (tuple): (x, y) position for the main text.
         sigma (float): Standard deviation for Gaussian blur.
-        offset (tuple, optional): (x, y) offset for the shadow relative to the main text. Defaults to (2,2).
+        canvas_size (tuple): (width, height) of the image to draw into.
+        origin (tuple): (x, y) position of the shadow text on the canvas.
+
+    Returns:
+        np.ndarray: Read-only (height, width) uint8 shadow alpha.
+    """
+    shadow_mask = Image.new('L', canvas_size, 0)
+    ImageDraw.Draw(shadow_mask).text(origin, text, font=load_font(font, font_size), fill=255)
+
+    shadow_alpha = blur(np.asarray(shadow_mask), sigma)
+    shadow_alpha.setflags(write=False)
+    return shadow_alpha
+
+def render_text(text, font, font_size, color, stroke_color = None, stroke_width = 1, shadow_sigma = None, shadow_offset = (3,3)):
+    """
+    Rasterizes text with Pillow into an RGBA image, with the blurred shadow composited underneath.
+
+    Args:
+        text (str): The text to render.
+        font (str): Font file or name for the text.
+        font_size (int): Font size for the text.
+        color (str): Text color.
+        stroke_color (str, optional): Outline color for the text.
+        stroke_width (int, optional): Outline thickness for the text.
+        shadow_sigma (float, optional): Standard deviation for the shadow blur, no shadow is drawn if None.
+        shadow_offset (tuple, optional): (x, y) offset for the shadow relative to the text. Defaults to (3,3).
 
     Returns:
-        TextClip: The shadow text clip, blurred and offset.
+        tuple: (height, width, 4) uint8 RGBA image of the text and the padding (int) added on every side.
     """
-    shadow_clip = TextClip(
+    image_font = load_font(font, font_size)
+
+    if stroke_color is None:
+        stroke_width = 0
+
+    #Leave room around the text so the shadow blur and offset are not cut off at the image edges
+    padding = 0
+    if shadow_sigma is not None:
+        padding = int(np.ceil(4 * shadow_sigma)) + max(abs(shadow_offset[0]), abs(shadow_offset[1]))
+
+    #Height comes from the font metrics so every line sits on the same baseline
+    left, _, right, _ = image_font.getbbox(text, stroke_width=stroke_width)
+    ascent, descent = image_font.getmetrics()
+    canvas_size = (right - left + 2 * padding, ascent + descent + 2 * stroke_width + 2 * padding)
+    origin = (padding - left, padding + stroke_width)
+
+    image = Image.new('RGBA', canvas_size, (0, 0, 0, 0))
+    ImageDraw.Draw(image).text(
+        origin,
         text,
-        font=font,
-        fontsize=font_size,
-        color='black'
-    ).set_start(start).set_duration(duration)
+        font=image_font,
+        fill=color,
+        stroke_width=stroke_width,
+        stroke_fill=stroke_color
+    )
 
-    shadow_pos = ('center' if position[0] == 'center' else position[0] + offset[1], position[1] + offset[1])
+    if shadow_sigma is not None:
+        shadow_origin = (origin[0] + shadow_offset[0], origin[1] + shadow_offset[1])
+        shadow_alpha = _render_shadow(text, font, font_size, shadow_sigma, canvas_size, shadow_origin)
+        shadow_image = Image.new('RGBA', canvas_size, (0, 0, 0, 0))
+        shadow_image.putalpha(Image.fromarray(shadow_alpha))
+        image = Image.alpha_composite(shadow_image, image)
 
-    shadow_clip = shadow_clip.set_position(shadow_pos)
-    shadow_clip = blur(shadow_clip, sigma=sigma)
-    return shadow_clip
+    return np.asarray(image), padding
 
-def create_caption_clip(caption_line_data, video_size, font = "Arial", font_size = 120, color = 'white', stroke_color = None, stroke_width = 1, caption_position = None, shadow = False):        
+def render_caption(caption_line_data, caption_position, font = "Arial", font_size = 120, color = 'white', stroke_color = None, stroke_width = 1, shadow = False):
     """
-    Creates a TextClip for a single caption line with specified styling and timing.
+    Renders a single caption line with specified styling and timing.
+
+    Only plain data is returned so this can run in a worker process.
 
     Args:
-        caption_word_data (dict): Dictionary containing 'line', 'start', and 'end' keys for the caption.
-        frame_size (tuple): (width, height) of the video frame.
-        font (str): Font name for the caption text.
+        caption_line_data (dict): Dictionary containing 'line', 'start', and 'end' keys for the caption.
+        caption_position (tuple): (x, y) position for the caption.
+        font (str): Font file or name for the caption text.
         font_size (int): Font size for the caption text.
         color (str): Text color.
         stroke_color (str, optional): Outline color for the text.
         stroke_width (int, optional): Outline thickness for the text.
-        caption_position (tuple, optional): (x, y) position for the caption. Defaults to bottom center.
         shadow (bool, optional): Whether or not shadows should be generated
 
     Returns:
-        TextClip: The configured caption clip.
+        dict: The rendered caption with 'image', 'start', 'duration' and 'position' keys.
     """
-    layers = []
+    image, padding = render_text(
+        caption_line_data['line'],
+        font,
+        font_size,
+        color,
+        stroke_color,
+        stroke_width,
+        shadow_sigma=5 if shadow else None,
+        shadow_offset=(3,3)
+    )
+
+    #The image is padded for the shadow, shift it back so the text stays in place
+    position = (
+        'center' if caption_position[0] == 'center' else caption_position[0] - padding,
+        caption_position[1] - padding
+    )
+
+    return {
+        'image': image,
+        'start': caption_line_data['start'],
+        'duration': caption_line_data['end'] - caption_line_data['start'],
+        'position': position
+    }
 
-    video_width, video_height = video_size[0], video_size[1]
+def create_caption_clip(rendered_caption):
+    """
+    Wraps a rendered caption in an ImageClip.
 
-    if caption_position is None:
-        caption_position = ('center', video_height * 3/4)     
+    Args:
+        rendered_caption (dict): Caption returned by render_caption.
 
-    full_duration = caption_line_data['end'] - caption_line_data['start']
+    Returns:
+        ImageClip: The configured caption clip.
+    """
+    from moviepy.editor import ImageClip
 
-    caption_clip = TextClip(
-        caption_line_data['line'],
-        font=font,
-        fontsize=font_size,
-        stroke_color=stroke_color,
-        stroke_width=stroke_width,
-        color=color
-    ).set_start(caption_line_data['start']).set_duration(full_duration)
-
-    caption_clip = caption_clip.set_position(caption_position)
-
-    if shadow:
-        shadow_clip = add_shadow_caption(
-            text=caption_line_data['line'],
-            font=font,
-            font_size=font_size,
-            start=caption_line_data['start'],
-            duration=full_duration,
-            position=caption_position,
-            sigma=5,            
-            offset=(3,3)
-        )
-        layers.append(shadow_clip)     
-
-    layers.append(caption_clip)
-    return layers
+    caption_clip = ImageClip(rendered_caption['image'], transparent=True)
+    caption_clip = caption_clip.set_start(rendered_caption['start']).set_duration(rendered_caption['duration'])
+    caption_clip = caption_clip.set_position(rendered_caption['position'])
+    return caption_clip
+
+def _init_render_worker():
+    """
+    Keeps OpenCV single threaded inside caption workers, the process pool already uses every core.
+    """
+    cv2.setNumThreads(1)
 
 def create_caption(caption_data, frame_size, subtitle_data):
     """
-    Creates a list of TextClips layers for all caption lines in the video.
+    Creates a caption clip for every caption line in the video.
+
+    Captions are rasterized in parallel across a process pool.
 
     Args:
         caption_data (list): List of dictionaries, each containing 'line', 'start', and 'end' keys for a caption.
@@ -280,42 +439,326 @@ def create_caption(caption_data, frame_size, subtitle_data):
         subtitle_data (dict): Subtitle style and configuration options (font, size, color, etc.).
 
     Returns:
-        list[list[TextClip]]: List of TextClip layer objects for each caption line.
-    """
-    final_caption_clips = []    
-    for caption in caption_data:
-        caption_clip = create_caption_clip(
-            caption_line_data=caption,
-            video_size=frame_size,
-            font=subtitle_data['Font'],
-            font_size=subtitle_data['Font Size'],
-            color=subtitle_data['Color'],
-            stroke_color=subtitle_data['Stroke Color'],
-            stroke_width=subtitle_data['Stroke Width'],
-            shadow=subtitle_data['Shadow']
-        )
-
-        for i in range(len(caption_clip)):
-            if i >= len(final_caption_clips):
-                final_caption_clips.append([caption_clip[i]])
-                continue
-
-            final_caption_clips[i].append(caption_clip[i])        
-    return final_caption_clips
+        list[ImageClip]: One ImageClip per caption line.
+    """
+    #Everything that is the same for every caption is worked out once here instead of in each worker
+    #Captions sit bottom center, with their top edge at 3/4 of the frame height
+    caption_position = ('center', frame_size[1] * 3/4)
+    font = resolve_font(subtitle_data['Font'])
+
+    render = partial(
+        render_caption,
+        caption_position=caption_position,
+        font=font,
+        font_size=subtitle_data['Font Size'],
+        color=subtitle_data['Color'],
+        stroke_color=subtitle_data['Stroke Color'],
+        stroke_width=subtitle_data['Stroke Width'],
+        shadow=subtitle_data['Shadow']
+    )
 
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as executor:
+        rendered_captions = list(executor.map(render, caption_data, chunksize=max(1, len(caption_data) // (workers * 4))))
 
-def main():
+    return [create_caption_clip(rendered_caption) for rendered_caption in rendered_captions]
+
+
+def render_with_moviepy(video_file_path, caption_data, subtitle_data, output_path):
     """
-    Main function to load configuration, process video/audio, and generate subtitles.
+    Composites the caption clips over the video with MoviePy and writes the result.
+
+    Args:
+        video_file_path (str): Path to the source video.
+        caption_data (list): List of dictionaries, each containing 'line', 'start', and 'end' keys for a caption.
+        subtitle_data (dict): Subtitle style and configuration options (font, size, color, etc.).
+        output_path (str): Path of the captioned video to write.
+    """
+    #MoviePy is only needed for this renderer, the default ass path runs without it
+    from moviepy.editor import CompositeVideoClip, VideoFileClip
+    from moviepy.config import FFMPEG_BINARY
+
+    video_clip = VideoFileClip(video_file_path)
+    video_size = video_clip.size
+
+    #Get a pre-composited clip for every caption
+    all_clips = create_caption(caption_data, video_size, subtitle_data)
+
+    #Output the new video, encoding on the GPU when MoviePy's own ffmpeg (imageio-ffmpeg by default) can use NVENC
+    encoder_options = {}
+    if nvenc_available(FFMPEG_BINARY):
+        encoder_options = {'codec': 'h264_nvenc', 'preset': 'p5', 'ffmpeg_params': ['-rc', 'vbr', '-cq', '23']}
+
+    final_video_clip = CompositeVideoClip([video_clip] + all_clips)
+    final_video_clip.write_videofile(output_path, audio_codec='aac', threads=os.cpu_count(), **encoder_options)
+
+def get_video_size(video_file_path):
+    """
+    Reads the displayed frame size of a video, accounting for rotation metadata.
+
+    Args:
+        video_file_path (str): Path to the video file.
+
+    Returns:
+        tuple: (width, height) of the video frame.
+    """
+    probe = ffmpeg.probe(video_file_path)
+    video_stream = next(stream for stream in probe['streams'] if stream['codec_type'] == 'video')
+    width, height = int(video_stream['width']), int(video_stream['height'])
+
+    #Phone videos are often stored sideways with a rotation flag, ffmpeg rotates them before filtering
+    rotation = video_stream.get('tags', {}).get('rotate')
+    for side_data in video_stream.get('side_data_list', []):
+        rotation = side_data.get('rotation', rotation)
+
+    if rotation is not None and abs(int(float(rotation))) % 180 == 90:
+        width, height = height, width
+    return width, height
+
+def ass_color(color):
+    """
+    Converts a color name or hex string to an ASS &HAABBGGRR color.
+
+    Args:
+        color (str): Color understood by Pillow, e.g. 'black' or '#fdff7a'.
+
+    Returns:
+        str: The color in ASS format.
+    """
+    red, green, blue = ImageColor.getrgb(color)[:3]
+    return f"&H00{blue:02X}{green:02X}{red:02X}"
+
+def ass_time(seconds):
+    """
+    Formats a time in seconds as an ASS h:mm:ss.cc timestamp.
+
+    Args:
+        seconds (float): Time in seconds.
+
+    Returns:
+        str: The formatted timestamp.
+    """
+    centiseconds = int(round(seconds * 100))
+    hours, centiseconds = divmod(centiseconds, 360000)
+    minutes, centiseconds = divmod(centiseconds, 6000)
+    secs, centiseconds = divmod(centiseconds, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centiseconds:02d}"
+
+def ass_text(text):
+    """
+    Escapes caption text for an ASS Dialogue line.
+
+    Args:
+        text (str): The caption text.
+
+    Returns:
+        str: Text safe to put in the Text field.
+    """
+    return text.replace('{', '\\{').replace('}', '\\}').replace('\n', '\\N')
+
+def ass_karaoke_text(caption):
+    """
+    Builds the Text field for a caption with a \\k karaoke tag timing each word.
+
+    Args:
+        caption (dict): Caption with 'start' and 'words' keys, as returned by combine_words.
+
+    Returns:
+        str: The caption text with karaoke timings.
     """
+    #Work from rounded absolute times so per-word rounding does not drift over the line
+    elapsed = int(round(caption['start'] * 100))
+    last = len(caption['words']) - 1
 
+    parts = []
+    for i, word in enumerate(caption['words']):
+        word_start = int(round(word['start'] * 100))
+        word_end = int(round(word['end'] * 100))
+
+        #Match the stripped 'line' text, words keep their leading space otherwise
+        text = word['text']
+        if i == 0:
+            text = text.lstrip()
+        if i == last:
+            text = text.rstrip()
+
+        #Pauses between words get an empty syllable so the highlight waits
+        if word_start > elapsed:
+            parts.append(f"{{\\k{word_start - elapsed}}}")
+            elapsed = word_start
+
+        parts.append(f"{{\\k{max(word_end - elapsed, 0)}}}{ass_text(text)}")
+        elapsed = max(word_end, elapsed)
+
+    return "".join(parts)
+
+def write_ass_subtitles(ass_filename, caption_data, frame_size, subtitle_data):
+    """
+    Writes caption lines to an ASS subtitle file styled like the MoviePy captions.
+
+    Args:
+        ass_filename (str): Path of the ASS file to write.
+        caption_data (iterable): Caption dictionaries with 'start', 'end' and 'words' keys, written as they are produced.
+        frame_size (tuple): (width, height) of the video frame.
+        subtitle_data (dict): Subtitle style and configuration options (font, size, color, etc.).
+
+    Returns:
+        str or None: Directory containing the font file if 'Font' is a path, None otherwise.
+    """
+    video_width, video_height = frame_size
+    font = subtitle_data['Font']
+    fonts_dir = None
+    bold = 0
+
+    #libass looks fonts up by family name, so a font file is passed by its directory and family
+    if os.path.isfile(font):
+        fonts_dir = os.path.dirname(os.path.abspath(font))
+        font, font_style = ImageFont.truetype(font).getname()
+        bold = -1 if 'Bold' in font_style else 0
+    else:
+        #Bold maps to the style flag, other styles are matched by libass through the full font name
+        font, font_style = split_font_pattern(font)
+        if font_style is not None and font_style.lower() == 'bold':
+            bold = -1
+        elif font_style is not None and font_style.lower() != 'regular':
+            font = f"{font} {font_style}"
+
+    stroke_color = subtitle_data['Stroke Color']
+    outline = subtitle_data['Stroke Width'] if stroke_color is not None else 0
+    shadow = 3 if subtitle_data['Shadow'] else 0
+    #Karaoke words start in SecondaryColour and switch to PrimaryColour as they are spoken
+    secondary = ass_color(subtitle_data['Color'])
+    primary = ass_color(subtitle_data.get('Highlight Color', subtitle_data['Color']))
+    outline_color = ass_color(stroke_color) if stroke_color is not None else secondary
+
+    #Alignment 8 is top center, so the caption's top edge sits at 3/4 of the frame like the MoviePy path
+    header = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {video_width}",
+        f"PlayResY: {video_height}",
+        "WrapStyle: 2",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        f"Style: Default,{font},{subtitle_data['Font Size']},{primary},{secondary},{outline_color},&H00000000,{bold},0,0,0,100,100,0,0,1,{outline},{shadow},8,0,0,{int(video_height * 3/4)},1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+
+    with open(ass_filename, 'w', encoding='utf-8') as file:
+        file.write("\n".join(header) + "\n")
+        for caption in caption_data:
+            file.write(f"Dialogue: 0,{ass_time(caption['start'])},{ass_time(caption['end'])},Default,,0,0,0,,{ass_karaoke_text(caption)}\n")
+
+    return fonts_dir
+
+@lru_cache(maxsize=None)
+def nvenc_available(ffmpeg_binary = 'ffmpeg'):
+    """
+    Checks whether an ffmpeg binary can actually encode with NVENC H.264 on this machine.
+
+    Many ffmpeg builds list h264_nvenc without an NVIDIA GPU or driver, so a one-frame test encode is run.
+
+    Args:
+        ffmpeg_binary (str, optional): ffmpeg executable to test. Defaults to the one on PATH.
+
+    Returns:
+        bool: True if h264_nvenc can be used.
+    """
+    if ctranslate2.get_cuda_device_count() == 0:
+        return False
+
+    test_encode = [
+        ffmpeg_binary, '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'color=s=256x256',
+        '-frames:v', '1', '-c:v', 'h264_nvenc', '-f', 'null', '-'
+    ]
+    try:
+        subprocess.run(test_encode, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return True
+
+def burn_subtitles(video_file_path, ass_filename, output_path, fonts_dir = None):
+    """
+    Burns an ASS subtitle file into a video with a single ffmpeg pass, copying the audio as is.
+
+    Args:
+        video_file_path (str): Path to the source video.
+        ass_filename (str): Path to the ASS subtitle file.
+        output_path (str): Path of the captioned video to write.
+        fonts_dir (str, optional): Extra directory libass should search for fonts.
+
+    Returns:
+        str or None: Path to the captioned video, or None if failed.
+    """
+    #Let ffmpeg-python escape the paths, drive letters and punctuation would break a hand built filter string
+    filter_options = {'filename': ass_filename}
+    if fonts_dir is not None:
+        filter_options['fontsdir'] = fonts_dir
+
+    #Try the GPU encoder first and fall back to libx264 if that run fails
+    video_codecs = ['h264_nvenc', 'libx264'] if nvenc_available() else ['libx264']
+
+    for video_codec in video_codecs:
+        try:
+            video_stream = ffmpeg.input(video_file_path)
+            captioned_video = ffmpeg.filter(video_stream.video, 'ass', **filter_options)
+
+            #NVENC defaults to a low fixed bitrate, use the same quality target as the MoviePy path
+            encoder_options = {}
+            if video_codec == 'h264_nvenc':
+                encoder_options = {'preset': 'p5', 'rc': 'vbr', 'cq': 23}
+
+            #'a?' keeps videos without an audio track working
+            #yuv420p keeps 10-bit phone footage encodable by NVENC and playable as 8-bit H.264
+            stream = ffmpeg.output(
+                captioned_video,
+                video_stream['a?'],
+                output_path,
+                vcodec=video_codec,
+                pix_fmt='yuv420p',
+                acodec='copy',
+                **encoder_options
+            )
+            stream = ffmpeg.overwrite_output(stream)
+            stream.run()
+            print(f"Captioned video generated: {output_path}")
+            return output_path
+        except ffmpeg.Error as e:
+            print(f"ffmpeg error ({video_codec}): {e}")
+    return None
+
+def parse_args():
+    """
+    Parses command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Generate and burn captions into a video.")
+    parser.add_argument(
+        '--dump-intermediates',
+        action='store_true',
+        help=f"Write the raw transcription to '{JSON_RAW_OUTPUT}' and the combined lines to '{JSON_MODIFIED_OUTPUT}'"
+    )
+    parser.add_argument(
+        '--renderer',
+        choices=['ass', 'moviepy'],
+        default='ass',
+        help="Burn captions in with ffmpeg and libass (default), or composite them with MoviePy"
+    )
+    return parser.parse_args()
+
+def main():
     """
-    dummy_clip = TextClip('Dummy Text')
-    available_fonts = dummy_clip.list('font')
-    for font in available_fonts:
-        print(font)
+    Main function to load configuration, process video/audio, and generate subtitles.
+    """
+    args = parse_args()
 
-    """    
     #Get data for subtitle info
     config_data = load_json_data(JSON_INFO)
 
@@ -325,37 +768,48 @@ def main():
     video_file_path = config_data['Filename']   
     subtitle_data = config_data['Subtitle Info'] 
 
-    audio_filename = convert_mp3_to_mp4(video_file_path)
-
-    #Output the audio file to JSON and store it
-    set_raw_output(audio_filename)
-    transcription_data = load_json_data(JSON_RAW_OUTPUT)
-
-    #Combine words based on subtitle info
-    processed_subtitles = combine_words(
-                                    transcription_data, 
-                                    subtitle_data['Max Chars'], 
-                                    subtitle_data['Max Duration'], 
-                                    subtitle_data['Max Gap']
-                                )
-    
-    
-    write_json_data(JSON_MODIFIED_OUTPUT, processed_subtitles)
-    processed_subtitles = load_json_data(JSON_MODIFIED_OUTPUT)
+    audio = extract_audio(video_file_path)
 
-    #Create caption for video
-    video_clip = VideoFileClip(video_file_path)
-    video_size = video_clip.size
-    
-    #Get the layers from caption and flatten it out
-    layers = create_caption(processed_subtitles, video_size, subtitle_data)     
-    all_clips = list(chain.from_iterable(layers))
+    if audio is None:
+        return
 
-    #Output the new video
-    final_video_clip = CompositeVideoClip([video_clip] + all_clips)
+    #Transcribe the audio into word-level timings, words are produced lazily as audio is decoded
+    transcription_data = set_raw_output(audio, batch_size=subtitle_data.get('Batch Size', 16))
+
+    if args.dump_intermediates or args.renderer == 'moviepy':
+        transcription_data = list(transcription_data)
+
+        #Combine words based on subtitle info
+        processed_subtitles = combine_words(
+                                        transcription_data, 
+                                        subtitle_data['Max Chars'], 
+                                        subtitle_data['Max Duration'], 
+                                        subtitle_data['Max Gap']
+                                    )
+    else:
+        #Nothing else needs the full word list, so lines are cut and written as words are transcribed
+        processed_subtitles = iter_subtitle_lines(
+                                        transcription_data,
+                                        subtitle_data['Max Chars'],
+                                        subtitle_data['Max Duration'],
+                                        subtitle_data['Max Gap']
+                                    )
+
+    #Only persist the intermediate data when asked, everything below works from memory
+    if args.dump_intermediates:
+        write_json_data(JSON_RAW_OUTPUT, transcription_data)
+        write_json_data(JSON_MODIFIED_OUTPUT, processed_subtitles)
+
+    output_path = video_file_path.replace('.mp4', '') + "_output.mp4"
+
+    if args.renderer == 'moviepy':
+        render_with_moviepy(video_file_path, processed_subtitles, subtitle_data, output_path)
+        return
 
-    video_file_path = video_file_path.replace('.mp4', '')
-    final_video_clip.write_videofile(video_file_path + "_output.mp4")    
+    #Let ffmpeg and libass draw the captions instead of compositing frames in Python
+    ass_filename = video_file_path.replace('.mp4', '') + ".ass"
+    fonts_dir = write_ass_subtitles(ass_filename, processed_subtitles, get_video_size(video_file_path), subtitle_data)
+    burn_subtitles(video_file_path, ass_filename, output_path, fonts_dir)
 
 if __name__ == '__main__':
     main()